@@ -0,0 +1,7 @@
+cdef void closest_sq_range(const double[::1] xs, const double[::1] ys, double tx, double ty,
+                           Py_ssize_t start, Py_ssize_t stop,
+                           double *best, Py_ssize_t *best_i) noexcept nogil
+
+cdef void closest_sq_3d_range(const double[::1] xs, const double[::1] ys, const double[::1] zs,
+                              double tx, double ty, double tz, Py_ssize_t start, Py_ssize_t stop,
+                              double *best, Py_ssize_t *best_i) noexcept nogil
@@ -0,0 +1,139 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# distutils: extra_compile_args = -O3 -ffast-math -march=native
+"""Closest-point kernels compiled with Cython, shared by the 2D and 3D benchmarks.
+
+The running minimum is seeded from the first point rather than INFINITY,
+since -ffast-math lets the C compiler assume infinities never occur. Each
+kernel keeps four running minima (one per unrolled lane) that are merged
+at the end.
+
+The range scans are declared in closest.pxd so threaded_closest.pyx can run
+them on per-thread slabs without the GIL.
+"""
+
+cdef inline void _merge_lane(double b, Py_ssize_t i, double *best, Py_ssize_t *best_i) noexcept nogil:
+    # Ties go to the lowest index, matching a single sequential scan
+    if b < best[0] or (b == best[0] and i < best_i[0]):
+        best[0] = b
+        best_i[0] = i
+
+cdef void closest_sq_range(const double[::1] xs, const double[::1] ys, double tx, double ty,
+                           Py_ssize_t start, Py_ssize_t stop,
+                           double *best, Py_ssize_t *best_i) noexcept nogil:
+    # Scans the non-empty range [start, stop)
+    cdef Py_ssize_t i, i0 = start, i1 = start, i2 = start, i3 = start
+    cdef double dx, dy, d, b0, b1, b2, b3
+    dx = xs[start] - tx
+    dy = ys[start] - ty
+    b0 = b1 = b2 = b3 = dx * dx + dy * dy
+    # Four independent running minima break the compare/select dependency
+    # chain, so consecutive points can be processed in parallel by the CPU
+    for i in range(start, stop - 3, 4):
+        dx = xs[i] - tx
+        dy = ys[i] - ty
+        d = dx * dx + dy * dy
+        if d < b0:
+            b0 = d
+            i0 = i
+        dx = xs[i + 1] - tx
+        dy = ys[i + 1] - ty
+        d = dx * dx + dy * dy
+        if d < b1:
+            b1 = d
+            i1 = i + 1
+        dx = xs[i + 2] - tx
+        dy = ys[i + 2] - ty
+        d = dx * dx + dy * dy
+        if d < b2:
+            b2 = d
+            i2 = i + 2
+        dx = xs[i + 3] - tx
+        dy = ys[i + 3] - ty
+        d = dx * dx + dy * dy
+        if d < b3:
+            b3 = d
+            i3 = i + 3
+    for i in range(stop - (stop - start) % 4, stop):
+        dx = xs[i] - tx
+        dy = ys[i] - ty
+        d = dx * dx + dy * dy
+        if d < b0:
+            b0 = d
+            i0 = i
+    best[0] = b0
+    best_i[0] = i0
+    _merge_lane(b1, i1, best, best_i)
+    _merge_lane(b2, i2, best, best_i)
+    _merge_lane(b3, i3, best, best_i)
+
+cdef void closest_sq_3d_range(const double[::1] xs, const double[::1] ys, const double[::1] zs,
+                              double tx, double ty, double tz, Py_ssize_t start, Py_ssize_t stop,
+                              double *best, Py_ssize_t *best_i) noexcept nogil:
+    # Scans the non-empty range [start, stop)
+    cdef Py_ssize_t i, i0 = start, i1 = start, i2 = start, i3 = start
+    cdef double dx, dy, dz, d, b0, b1, b2, b3
+    dx = xs[start] - tx
+    dy = ys[start] - ty
+    dz = zs[start] - tz
+    b0 = b1 = b2 = b3 = dx*dx + dy*dy + dz*dz
+    for i in range(start, stop - 3, 4):
+        dx = xs[i] - tx
+        dy = ys[i] - ty
+        dz = zs[i] - tz
+        d = dx*dx + dy*dy + dz*dz
+        if d < b0:
+            b0 = d
+            i0 = i
+        dx = xs[i + 1] - tx
+        dy = ys[i + 1] - ty
+        dz = zs[i + 1] - tz
+        d = dx*dx + dy*dy + dz*dz
+        if d < b1:
+            b1 = d
+            i1 = i + 1
+        dx = xs[i + 2] - tx
+        dy = ys[i + 2] - ty
+        dz = zs[i + 2] - tz
+        d = dx*dx + dy*dy + dz*dz
+        if d < b2:
+            b2 = d
+            i2 = i + 2
+        dx = xs[i + 3] - tx
+        dy = ys[i + 3] - ty
+        dz = zs[i + 3] - tz
+        d = dx*dx + dy*dy + dz*dz
+        if d < b3:
+            b3 = d
+            i3 = i + 3
+    for i in range(stop - (stop - start) % 4, stop):
+        dx = xs[i] - tx
+        dy = ys[i] - ty
+        dz = zs[i] - tz
+        d = dx*dx + dy*dy + dz*dz
+        if d < b0:
+            b0 = d
+            i0 = i
+    best[0] = b0
+    best_i[0] = i0
+    _merge_lane(b1, i1, best, best_i)
+    _merge_lane(b2, i2, best, best_i)
+    _merge_lane(b3, i3, best, best_i)
+
+cpdef tuple closest_sq(const double[::1] xs, const double[::1] ys, double tx, double ty):
+    """Return (index, squared distance) of the point closest to (tx, ty)"""
+    cdef Py_ssize_t best_i
+    cdef double best
+    if xs.shape[0] == 0:
+        raise ValueError("closest_sq() needs at least one point")
+    closest_sq_range(xs, ys, tx, ty, 0, xs.shape[0], &best, &best_i)
+    return best_i, best
+
+cpdef tuple closest_sq_3d(const double[::1] xs, const double[::1] ys, const double[::1] zs,
+                          double tx, double ty, double tz):
+    """Return (index, squared distance) of the 3D point closest to (tx, ty, tz)"""
+    cdef Py_ssize_t best_i
+    cdef double best
+    if xs.shape[0] == 0:
+        raise ValueError("closest_sq_3d() needs at least one point")
+    closest_sq_3d_range(xs, ys, zs, tx, ty, tz, 0, xs.shape[0], &best, &best_i)
+    return best_i, best
@@ -0,0 +1,121 @@
+"""Process-pool closest-point scan for the pure-Python loop, shared by the 2D and 3D benchmarks.
+
+Each slab of the points gets its own single-process executor, so a slab
+always goes to the worker that holds it. The coordinate columns are copied
+once into shared memory and every worker reads only its own slab from there
+at start-up; queries then send just the target.
+
+Workers are spawned rather than forked: forking after Numba or BLAS have
+started their thread pools can deadlock. Spawned children normally re-run
+the parent's main script, which for the benchmarks means importing SciPy,
+scikit-learn and Numba and building the Cython and AVX2 kernels, so the
+workers are started without it and only import this module.
+"""
+import contextlib
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from operator import itemgetter
+import numpy as np
+
+# Coordinate columns of the one slab each worker process scans
+_worker_slab = None
+
+def _closest_sq(slab, target):
+    min_dist_sq = float('inf')
+    closest_point = None
+    tx, ty = target
+    for x, y in slab:
+        dx = x - tx
+        dy = y - ty
+        dist_sq = dx * dx + dy * dy
+        if dist_sq < min_dist_sq:
+            min_dist_sq = dist_sq
+            closest_point = (x, y)
+    return closest_point, min_dist_sq
+
+def _closest_sq_3d(slab, target):
+    min_dist_sq = float('inf')
+    closest_point = None
+    tx, ty, tz = target
+    for x, y, z in slab:
+        dx = x - tx
+        dy = y - ty
+        dz = z - tz
+        dist_sq = dx*dx + dy*dy + dz*dz
+        if dist_sq < min_dist_sq:
+            min_dist_sq = dist_sq
+            closest_point = (x, y, z)
+    return closest_point, min_dist_sq
+
+def _init_worker(shm_name, shape, dtype, start, stop):
+    global _worker_slab
+    shm = shared_memory.SharedMemory(name=shm_name)
+    columns = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    # Only this worker's slab becomes Python floats, once, for the plain loop
+    _worker_slab = columns[:, start:stop].tolist()
+    del columns
+    shm.close()
+
+def _closest_in_slab(target):
+    scan = _closest_sq if len(target) == 2 else _closest_sq_3d
+    return scan(zip(*_worker_slab), target)
+
+@contextlib.contextmanager
+def _without_main_script():
+    # spawn re-runs the main script in each child only if __main__ has a
+    # __spec__ or __file__ saying where to find it
+    main = sys.modules['__main__']
+    main_file = main.__dict__.pop('__file__', None)
+    main_spec, main.__spec__ = getattr(main, '__spec__', None), None
+    try:
+        yield
+    finally:
+        main.__spec__ = main_spec
+        if main_file is not None:
+            main.__file__ = main_file
+
+def start_closest_pool(points, num_workers=None):
+    """Start one worker process per slab of the (N, 2) or (N, 3) points"""
+    num_workers = num_workers or os.cpu_count() or 1
+    columns = np.ascontiguousarray(points.T)
+    shm = shared_memory.SharedMemory(create=True, size=columns.nbytes)
+    pools = []
+    try:
+        np.ndarray(columns.shape, dtype=columns.dtype, buffer=shm.buf)[:] = columns
+        context = multiprocessing.get_context('spawn')
+        n = len(points)
+        # Processes are started by submit(), so the warm-up query is what
+        # needs the main script hidden
+        with _without_main_script():
+            for k in range(num_workers):
+                pools.append(ProcessPoolExecutor(
+                    max_workers=1, mp_context=context, initializer=_init_worker,
+                    initargs=(shm.name, columns.shape, columns.dtype.str,
+                              k * n // num_workers, (k + 1) * n // num_workers)))
+            futures = [pool.submit(_closest_in_slab, (0,) * columns.shape[0]) for pool in pools]
+        # Run an empty query per worker so process start-up is not paid by the
+        # first query; once every worker has copied its slab the shared memory can go
+        for future in futures:
+            future.result()
+    except BaseException:
+        stop_closest_pool(pools)
+        raise
+    finally:
+        shm.close()
+        shm.unlink()
+    return pools
+
+def stop_closest_pool(pools):
+    """Shut down the worker processes started by start_closest_pool"""
+    for pool in pools:
+        pool.shutdown()
+
+def find_closest_parallel(pools, target):
+    """Find closest point by scanning slabs of the points in worker processes"""
+    futures = [pool.submit(_closest_in_slab, target) for pool in pools]
+    results = [future.result() for future in futures]
+    # min() keeps the first of equal results, so ties resolve in slab order
+    return min(results, key=itemgetter(1))
@@ -0,0 +1,79 @@
+"""ctypes bindings for the AVX2 closest-point kernels in closest_simd.c.
+
+The shared library is compiled with the system C compiler ($CC, default cc)
+on first import and rebuilt whenever the C source is newer. Importing raises
+ImportError when the library cannot be built or the CPU lacks AVX2/FMA, so
+the benchmarks treat this module like any other optional dependency.
+"""
+import ctypes
+import os
+import subprocess
+import numpy as np
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_SOURCE = os.path.join(_HERE, 'closest_simd.c')
+# Not named closest_simd.so: Python would pick that up as an extension module
+# named closest_simd in preference to this file
+_LIBRARY = os.path.join(_HERE, 'libclosest_simd.so')
+
+def _build_library():
+    """Compile closest_simd.c into a shared library next to it"""
+    cmd = [os.environ.get('CC', 'cc'), '-O3', '-shared', '-fPIC', _SOURCE, '-o', _LIBRARY, '-lm']
+    try:
+        subprocess.run(cmd, check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError) as exc:
+        raise ImportError(f"could not compile {_SOURCE}: {exc}") from exc
+
+if not os.path.exists(_LIBRARY) or os.path.getmtime(_LIBRARY) < os.path.getmtime(_SOURCE):
+    _build_library()
+
+_lib = ctypes.CDLL(_LIBRARY)
+if not _lib.closest_simd_supported():
+    raise ImportError("closest_simd needs a CPU with AVX2 and FMA")
+
+# Columns are passed as bare addresses and checked once in Python: ndpointer
+# argtypes would redo the checks on every call and cost more than the kernel
+# itself for small inputs
+_column = ctypes.c_void_p
+_double_p = ctypes.POINTER(ctypes.c_double)
+
+_lib.closest_sq_avx2.restype = ctypes.c_ssize_t
+_lib.closest_sq_avx2.argtypes = [_column, _column, ctypes.c_ssize_t,
+                                 ctypes.c_double, ctypes.c_double, _double_p]
+_lib.closest_sq_3d_avx2.restype = ctypes.c_ssize_t
+_lib.closest_sq_3d_avx2.argtypes = [_column, _column, _column, ctypes.c_ssize_t,
+                                    ctypes.c_double, ctypes.c_double, ctypes.c_double,
+                                    _double_p]
+
+def _check_columns(name, xs, *others):
+    """Raise unless every column is 1-D C-contiguous float64 of the same non-zero length"""
+    for column in (xs,) + others:
+        if column.dtype != np.float64 or column.ndim != 1 or not column.flags.c_contiguous:
+            raise TypeError(f"{name}() needs 1-D C-contiguous float64 columns")
+        if column.size != xs.size:
+            raise ValueError(f"{name}() needs columns of equal length")
+    if xs.size == 0:
+        raise ValueError(f"{name}() needs at least one point")
+
+def _address(column):
+    """Return the address of a checked column's data, more cheaply than column.ctypes.data"""
+    if column.flags.writeable:
+        return ctypes.addressof(ctypes.c_char.from_buffer(column))
+    # from_buffer refuses read-only buffers, even though the kernels only read
+    return column.ctypes.data
+
+def closest_sq_avx2(xs, ys, tx, ty):
+    """Return (index, squared distance) of the point closest to (tx, ty)"""
+    _check_columns('closest_sq_avx2', xs, ys)
+    dist_sq = ctypes.c_double()
+    i = _lib.closest_sq_avx2(_address(xs), _address(ys), xs.size, tx, ty,
+                             ctypes.byref(dist_sq))
+    return i, dist_sq.value
+
+def closest_sq_3d_avx2(xs, ys, zs, tx, ty, tz):
+    """Return (index, squared distance) of the 3D point closest to (tx, ty, tz)"""
+    _check_columns('closest_sq_3d_avx2', xs, ys, zs)
+    dist_sq = ctypes.c_double()
+    i = _lib.closest_sq_3d_avx2(_address(xs), _address(ys), _address(zs), xs.size,
+                                tx, ty, tz, ctypes.byref(dist_sq))
+    return i, dist_sq.value
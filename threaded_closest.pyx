@@ -0,0 +1,69 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# distutils: extra_compile_args = -O3 -ffast-math -march=native -fopenmp
+# distutils: extra_link_args = -fopenmp
+"""Multi-threaded closest-point kernels built on the range scans in closest.pyx.
+
+The points are split into one slab per thread, each slab is scanned by
+closest_sq_range / closest_sq_3d_range inside a nogil prange, and the slab
+minima are merged in slab order with ties going to the lowest index. Kept
+apart from closest.pyx so a compiler without OpenMP only loses these kernels.
+"""
+from cython.parallel cimport prange
+from libc.stdlib cimport free, malloc
+
+from closest cimport closest_sq_range, closest_sq_3d_range
+
+cdef tuple _merge_slabs(double *slab_mins, Py_ssize_t *slab_indices, Py_ssize_t num_slabs):
+    cdef Py_ssize_t s, best_i = slab_indices[0]
+    cdef double best = slab_mins[0]
+    for s in range(1, num_slabs):
+        if slab_mins[s] < best:
+            best = slab_mins[s]
+            best_i = slab_indices[s]
+    return best_i, best
+
+cpdef tuple closest_sq_parallel(const double[::1] xs, const double[::1] ys, double tx, double ty,
+                                int num_threads):
+    """Return (index, squared distance) of the point closest to (tx, ty), using threads"""
+    cdef Py_ssize_t n = xs.shape[0], s
+    cdef Py_ssize_t num_slabs = min(max(num_threads, 1), n)
+    cdef double *slab_mins
+    cdef Py_ssize_t *slab_indices
+    if n == 0:
+        raise ValueError("closest_sq_parallel() needs at least one point")
+    slab_mins = <double *> malloc(num_slabs * sizeof(double))
+    slab_indices = <Py_ssize_t *> malloc(num_slabs * sizeof(Py_ssize_t))
+    try:
+        if slab_mins == NULL or slab_indices == NULL:
+            raise MemoryError()
+        # Slabs are never empty since num_slabs <= n
+        for s in prange(num_slabs, nogil=True, num_threads=num_slabs, schedule='static'):
+            closest_sq_range(xs, ys, tx, ty, s * n // num_slabs, (s + 1) * n // num_slabs,
+                             &slab_mins[s], &slab_indices[s])
+        return _merge_slabs(slab_mins, slab_indices, num_slabs)
+    finally:
+        free(slab_mins)
+        free(slab_indices)
+
+cpdef tuple closest_sq_3d_parallel(const double[::1] xs, const double[::1] ys, const double[::1] zs,
+                                   double tx, double ty, double tz, int num_threads):
+    """Return (index, squared distance) of the 3D point closest to (tx, ty, tz), using threads"""
+    cdef Py_ssize_t n = xs.shape[0], s
+    cdef Py_ssize_t num_slabs = min(max(num_threads, 1), n)
+    cdef double *slab_mins
+    cdef Py_ssize_t *slab_indices
+    if n == 0:
+        raise ValueError("closest_sq_3d_parallel() needs at least one point")
+    slab_mins = <double *> malloc(num_slabs * sizeof(double))
+    slab_indices = <Py_ssize_t *> malloc(num_slabs * sizeof(Py_ssize_t))
+    try:
+        if slab_mins == NULL or slab_indices == NULL:
+            raise MemoryError()
+        # Slabs are never empty since num_slabs <= n
+        for s in prange(num_slabs, nogil=True, num_threads=num_slabs, schedule='static'):
+            closest_sq_3d_range(xs, ys, zs, tx, ty, tz, s * n // num_slabs,
+                                (s + 1) * n // num_slabs, &slab_mins[s], &slab_indices[s])
+        return _merge_slabs(slab_mins, slab_indices, num_slabs)
+    finally:
+        free(slab_mins)
+        free(slab_indices)